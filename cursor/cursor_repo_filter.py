@@ -1,11 +1,62 @@
 import pandas as pd
 import os
+import re
 import glob
 import csv
 import requests
 from tqdm import tqdm
 import time
 
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is optional; fall back to the regex scan
+    ahocorasick = None
+
+# Directory where the script is located
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Keywords to match, lowercased once at import time
+KEYWORDS = tuple(keyword.lower() for keyword in [
+    "Cursor IDE", "Cursor AI", 
+    "using Cursor", "Cursor Agent", "use Cursor", "with Cursor", "by Cursor", "in Cursor", "through Cursor", "via Cursor",
+    "claude", "sonnet 3.7", "deepseek", 
+    "制作", "实现", "编写", "生成", "创建", "开发", 
+    "built", "build", 
+    "基于Cursor", "通过Cursor", "借助Cursor", "用cursor", "由cursor"
+])
+
+# Exclusion keywords, lowercased once at import time
+EXCLUSION_KEYWORDS = tuple(keyword.lower() for keyword in [
+    "test", "demo", "learn", "practice", "practical", "rule", "rules", "mouse", "pagination", 
+    "a cursor", "重置", "无限试用", "curse", "3D cursor", "your cursor", 
+    "custom cursor", "教程", "cursor navigation", "navigation", "cursor move", "学习", 
+    "资源", "会员", "付费", "订阅", "example", "教学", "课程", "指南", "练习", 
+    "awesome", "示例", "movement", "keyboard", "custom", "position", "animat", "pointer", 
+    "theme", "attempt", "moving", "move", "Paginate", "Trying", "try", "simple", "quick", 
+    "oracle", "store procedure", "mysql", "sql server", "cursor library", "Drawing", "draw", 
+    "prompt", "collection", "hand gesture", "canvas", "click", "cursor array", "SQL", 
+    "experiment", "scrollbar", "Portfolio", "template", "course", "tutorial", "toy", "玩具", 
+    "实验", "live cursor", "guideline", "quiz", "small", "exploring", "realtime", "real-time"
+])
+
+def build_automaton(words):
+    """
+    Build an Aho-Corasick automaton matching any of the given lowercase words
+    """
+    automaton = ahocorasick.Automaton()
+    for word in words:
+        automaton.add_word(word, True)
+    automaton.make_automaton()
+    return automaton
+
+def matches_any(text, automaton):
+    """
+    Return True as soon as the automaton finds one match in the text
+    """
+    for _ in automaton.iter(text):
+        return True
+    return False
+
 def get_github_stats(repo_url, github_token=None):
     """
     Get repository statistics from GitHub API
@@ -149,45 +200,18 @@ def analyze_repo_stats(df):
     #     print(df['lines_range'].value_counts().sort_index())
 
 def filter_csv_by_keywords():
-    # Define the keywords to match
-    keywords = [
-        "Cursor IDE", "Cursor AI", 
-        "using Cursor", "Cursor Agent", "use Cursor", "with Cursor", "by Cursor", "in Cursor", "through Cursor", "via Cursor",
-        "claude", "sonnet 3.7", "deepseek", 
-        "制作", "实现", "编写", "生成", "创建", "开发", 
-        "built", "build", 
-        "基于Cursor", "通过Cursor", "借助Cursor", "用cursor", "由cursor"
-    ]
-    
-    # Define the exclusion keywords
-    exclusion_keywords = [
-        "test", "demo", "learn", "practice", "practical", "rule", "rules", "mouse", "pagination", 
-        "a cursor", "重置", "无限试用", "curse", "3D cursor", "your cursor", 
-        "custom cursor", "教程", "cursor navigation", "navigation", "cursor move", "学习", 
-        "资源", "会员", "付费", "订阅", "example", "教学", "课程", "指南", "练习", 
-        "awesome", "示例", "movement", "keyboard", "custom", "position", "animat", "pointer", 
-        "theme", "attempt", "moving", "move", "Paginate", "Trying", "try", "simple", "quick", 
-        "oracle", "store procedure", "mysql", "sql server", "cursor library", "Drawing", "draw", 
-        "prompt", "collection", "hand gesture", "canvas", "click", "cursor array", "SQL", 
-        "experiment", "scrollbar", "Portfolio", "template", "course", "tutorial", "toy", "玩具", 
-        "实验", "live cursor", "guideline", "quiz", "small", "exploring", "realtime", "real-time"
-    ]
-    
-    # Get the directory where the script is located
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    
     # Define the specific input file name
-    input_file = os.path.join(script_dir, "filtered_cursor_all_repo.xlsx")
+    input_file = os.path.join(SCRIPT_DIR, "filtered_cursor_all_repo.xlsx")
     
     # Check if the file exists
     if not os.path.exists(input_file):
         print(f"Error: File 'filtered_cursor_repo.xlsx' not found!")
-        print(f"Looking in directory: {script_dir}")
+        print(f"Looking in directory: {SCRIPT_DIR}")
         return
     
     print(f"Processing file: {input_file}")
     
-    # Read the Excel file
+    # Read the Excel file once; openpyxl parses every cell regardless of usecols/skiprows
     df = pd.read_excel(input_file)
     
     # Check if the required columns exist
@@ -198,21 +222,25 @@ def filter_csv_by_keywords():
     # Get the description column (second column)
     description_col = df.columns[1]
     
-    # Create a function to check if any keyword exists in the description
-    def contains_keyword(text):
-        if pd.isna(text):
-            return False
-        return any(keyword.lower() in str(text).lower() for keyword in keywords)
-    
-    # Create a function to check if any exclusion keyword exists in the description
-    def contains_exclusion_keyword(text):
-        if pd.isna(text):
-            return False
-        return any(keyword.lower() in str(text).lower() for keyword in exclusion_keywords)
-    
     # Filter the dataframe - first include records with keywords, then exclude records with exclusion keywords
-    filtered_df = df[df[description_col].apply(contains_keyword)]
-    filtered_df = filtered_df[~filtered_df[description_col].apply(contains_exclusion_keyword)]
+    descriptions = df[description_col].astype("string").str.lower()
+    if ahocorasick is not None:
+        # Single linear scan per description regardless of how many keywords there are
+        keyword_automaton = build_automaton(KEYWORDS)
+        exclusion_automaton = build_automaton(EXCLUSION_KEYWORDS)
+        mask = [matches_any(text, keyword_automaton) and not matches_any(text, exclusion_automaton)
+                for text in descriptions.fillna("").tolist()]
+    else:
+        # Build one alternation pattern per keyword list so the scan runs inside pandas' regex engine
+        keyword_pattern = "|".join(map(re.escape, KEYWORDS))
+        exclusion_pattern = "|".join(map(re.escape, EXCLUSION_KEYWORDS))
+        mask = descriptions.str.contains(keyword_pattern, regex=True, na=False)
+        # Most descriptions are rejected by the inclusion scan, so only the survivors get the exclusion scan
+        candidates = descriptions[mask]
+        excluded = candidates.str.contains(exclusion_pattern, regex=True, na=False).to_numpy(dtype=bool)
+        mask.loc[candidates.index[excluded]] = False
+    
+    filtered_df = df[mask]
     
     # Get GitHub token from environment variable
     github_token = os.environ.get('GITHUB_TOKEN')
@@ -253,11 +281,12 @@ def filter_csv_by_keywords():
     # Analyze and print statistics
     analyze_repo_stats(filtered_df)
     
-    # Generate output filename
-    output_file = os.path.join(script_dir, f"filtered_{os.path.basename(input_file)}")
+    # Generate output filename (Parquet is far faster to write than cell-by-cell xlsx)
+    output_name = os.path.splitext(os.path.basename(input_file))[0]
+    output_file = os.path.join(SCRIPT_DIR, f"filtered_{output_name}.parquet")
     
     # Save the filtered results
-    filtered_df.to_excel(output_file, index=False)
+    filtered_df.to_parquet(output_file, engine='pyarrow', compression='zstd', index=False)
     print(f"\nFiltered results saved to: {output_file}")
     print(f"Original records: {len(df)}")
     print(f"Filtered records: {len(filtered_df)}")
@@ -1,40 +1,151 @@
 import requests
 import os
+import shelve
 import time
-from datetime import datetime
-from typing import Dict
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Set, Tuple
+from urllib.parse import urlencode
 import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to requests' stdlib json parsing
+    orjson = None
+
+# 脚本所在目录, 结果文件保存在这里
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def time_windows(start: date, end: date) -> List[Tuple[date, date]]:
+    """Split the [start, end] creation-date range into calendar-month windows."""
+    windows = []
+    window_start = start
+    while window_start <= end:
+        next_month = (window_start.replace(day=1) + timedelta(days=32)).replace(day=1)
+        windows.append((window_start, min(next_month - timedelta(days=1), end)))
+        window_start = next_month
+    return windows
+
+class RepoTable:
+    """Column-oriented store of repositories, deduplicated by full name."""
+    def __init__(self):
+        self.index: Dict[str, int] = {}  # 仓库名 -> 行号
+        self.names: List[str] = []
+        self.urls: List[str] = []
+        self.descriptions: List[str] = []
+        self.found_by: List[Set[str]] = []
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add(self, name: str, url: str, description: str, found_by: str) -> None:
+        """Append a new repository or extend the found_by information of an existing one."""
+        row = self.index.get(name)
+        if row is None:
+            self.index[name] = len(self.names)
+            self.names.append(name)
+            self.urls.append(url)
+            self.descriptions.append(description)
+            self.found_by.append({found_by})
+        else:
+            self.found_by[row].add(found_by)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Build a DataFrame straight from the column lists, sorted by found_by."""
+        df = pd.DataFrame({
+            'name': self.names,
+            'url': self.urls,
+            'description': self.descriptions,
+            'found_by': [", ".join(sorted(labels)) for labels in self.found_by]
+        })
+        return df.sort_values('found_by', kind='stable')
 
 class GitHubSearch:
-    def __init__(self, token: str):
-        self.token = token
-        self.headers = {
-            'Authorization': f'token {token}',
-            'Accept': 'application/vnd.github.v3+json'
-        }
+    def __init__(self, tokens: List[str]):
+        self.tokens = tokens
+        # 每个token独立记录剩余请求数和重置时间, remaining为None表示额度未知或已重置
+        self.rate_limits: Dict[str, Dict] = {token: {'remaining': None, 'reset': 0} for token in tokens}
         self.base_url = "https://api.github.com"
-        self.repos: Dict[str, Dict] = {}  # 存储所有搜索结果
-        self.current_search_repos: Dict[str, Dict] = {}  # 存储当前搜索循环的结果
+        # 复用同一个连接池(keep-alive), 并对网关类错误自动重试
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32,
+                              max_retries=Retry(total=5, backoff_factor=1, status_forcelist=[502, 503, 504]))
+        self.session.mount('https://', adapter)
+        self.repos = RepoTable()  # 存储所有搜索结果
+        self.current_search_repos = RepoTable()  # 存储当前搜索循环的结果
         self.per_page = 100
         self.max_results = 1000
         # 确保cursor文件夹存在
-        self.output_dir = os.path.dirname(os.path.abspath(__file__))
+        self.output_dir = SCRIPT_DIR
         os.makedirs(self.output_dir, exist_ok=True)
+        # 按请求URL缓存ETag和对应页面, 未变化的页面返回304且不消耗速率限制额度
+        self.etag_cache_path = os.path.join(self.output_dir, 'cursor_etag_cache')
 
-    def _check_rate_limit(self, response) -> bool:
-        """Check GitHub API rate limit and wait if necessary."""
+    def _headers_for(self, token: str) -> Dict:
+        """Build the request headers for a given token."""
+        return {
+            'Authorization': f'token {token}',
+            'Accept': 'application/vnd.github.v3+json'
+        }
+
+    def _next_token(self) -> str:
+        """Pick the token with the most remaining quota, waiting if all of them are exhausted."""
+        now = int(time.time())
+        for limits in self.rate_limits.values():
+            if limits['reset'] <= now:
+                limits['remaining'] = None
+        
+        available = [token for token, limits in self.rate_limits.items()
+                     if limits['remaining'] is None or limits['remaining'] > 1]
+        if not available:
+            earliest_reset = min(limits['reset'] for limits in self.rate_limits.values())
+            wait_time = max(earliest_reset - now, 0) + 10
+            print(f"\nRate limit reached for all {len(self.tokens)} tokens. Waiting {wait_time} seconds...")
+            time.sleep(wait_time)
+            return self._next_token()
+        
+        return max(available, key=lambda token: self.rate_limits[token]['remaining'] or float('inf'))
+
+    def _check_rate_limit(self, response, token: str) -> bool:
+        """Record the token's GitHub API rate limit and report whether it is exhausted."""
         rate_limit_remaining = int(response.headers.get('X-RateLimit-Remaining', 0))
         rate_limit_reset = int(response.headers.get('X-RateLimit-Reset', 0))
+        self.rate_limits[token] = {'remaining': rate_limit_remaining, 'reset': rate_limit_reset}
+        return rate_limit_remaining <= 1
+
+    def _get_page(self, url: str, params: Dict, token: str) -> Dict:
+        """GET one search page, revalidating a previously cached copy with its ETag."""
+        cache_key = f"{url}?{urlencode(sorted(params.items()))}"
+        headers = self._headers_for(token)
         
-        if rate_limit_remaining <= 1:
-            wait_time = max(rate_limit_reset - int(time.time()), 0) + 10
-            print(f"\nRate limit reached. Waiting {wait_time} seconds...")
-            time.sleep(wait_time)
-            return True
-        return False
+        with shelve.open(self.etag_cache_path) as etag_cache:
+            cached = etag_cache.get(cache_key)
+            if cached:
+                headers['If-None-Match'] = cached['etag']
+            
+            response = self.session.get(url, headers=headers, params=params)
+            response.raise_for_status()
+            
+            # An exhausted token still returns a valid page; the next request picks another token
+            self._check_rate_limit(response, token)
+            if response.status_code == 304:
+                return cached['data']
+            
+            data = orjson.loads(response.content) if orjson else response.json()
+            if 'ETag' in response.headers:
+                etag_cache[cache_key] = {
+                    'etag': response.headers['ETag'],
+                    'data': {'total_count': data['total_count'], 'items': data['items']}
+                }
+            return data
+
+    def _make_request(self, url: str, params: Dict, stop_on_overflow: bool = False) -> Dict:
+        """Make a request with rate limit handling and pagination.
 
-    def _make_request(self, url: str, params: Dict) -> Dict:
-        """Make a request with rate limit handling and pagination."""
+        With stop_on_overflow, only page 1 is fetched when total_count exceeds max_results,
+        so the caller can narrow the query instead of losing everything past the cap.
+        """
         all_items = []
         total_count = 0
         page = 1
@@ -43,35 +154,36 @@ class GitHubSearch:
             try:
                 # Add page parameter
                 params['page'] = page
-                response = requests.get(url, headers=self.headers, params=params)
-                response.raise_for_status()
-                
-                if not self._check_rate_limit(response):
-                    data = response.json()
-                    if page == 1:
-                        total_count = data['total_count']
-                        print(f"Total repositories found: {total_count} repositories with query: {url}")
-                    
-                    items = data['items']
-                    if not items:  # No more items
+                token = self._next_token()
+                data = self._get_page(url, params, token)
+                if page == 1:
+                    total_count = data['total_count']
+                    print(f"Total repositories found: {total_count} repositories with query: {url}")
+                    if stop_on_overflow and total_count > self.max_results:
                         break
-                        
-                    all_items.extend(items)
-                    print(f"Fetched page {page}, total items: {len(all_items)}")
+                
+                items = data['items']
+                if not items:  # No more items
+                    break
                     
-                    # Check if we've fetched all items or reached the maximum
-                    if len(all_items) >= min(total_count, self.max_results):
-                        break
-                        
-                    page += 1
-                    # Add a small delay between pages to avoid rate limiting
-                    time.sleep(1)
+                all_items.extend(items)
+                print(f"Fetched page {page}, total items: {len(all_items)}")
+                
+                # Check if we've fetched all items or reached the maximum
+                if len(all_items) >= min(total_count, self.max_results):
+                    break
                     
+                page += 1
+                # Add a small delay between pages to avoid rate limiting
+                time.sleep(1)
+                
             except requests.exceptions.HTTPError as e:
                 if e.response.status_code == 403:
-                    wait_time = max(int(e.response.headers.get('X-RateLimit-Reset', 0)) - int(time.time()), 0) + 10
-                    print(f"Rate limit reached. Waiting {wait_time} seconds...")
-                    time.sleep(wait_time)
+                    # Mark this token as exhausted; _next_token rotates or waits for the earliest reset
+                    self.rate_limits[token] = {
+                        'remaining': 0,
+                        'reset': int(e.response.headers.get('X-RateLimit-Reset', 0)) or int(time.time()) + 60
+                    }
                     continue
                 else:
                     print(f"HTTP error occurred: {e}")
@@ -85,131 +197,96 @@ class GitHubSearch:
     def _add_repository(self, repo_data: Dict, found_by: str, is_current_search: bool = True) -> None:
         """Add a repository to the results or update its found_by information."""
         repo_name = repo_data['full_name']
-        repo_info = {
-            'url': repo_data['html_url'],
-            'description': repo_data.get('description', 'No description'),
-            'found_by': found_by
-        }
+        url = repo_data['html_url']
+        description = repo_data.get('description', 'No description')
 
         # Add to current search results
         if is_current_search:
-            if repo_name not in self.current_search_repos:
-                self.current_search_repos[repo_name] = repo_info
-            else:
-                if found_by not in self.current_search_repos[repo_name]['found_by']:
-                    self.current_search_repos[repo_name]['found_by'] += f", {found_by}"
+            self.current_search_repos.add(repo_name, url, description, found_by)
 
         # Add to all results
-        if repo_name not in self.repos:
-            self.repos[repo_name] = repo_info
-        else:
-            if found_by not in self.repos[repo_name]['found_by']:
-                self.repos[repo_name]['found_by'] += f", {found_by}"
+        self.repos.add(repo_name, url, description, found_by)
 
-    def _save_search_results(self, search_type: str, repos_dict: Dict[str, Dict], timestamp: str = None) -> None:
+    def _save_search_results(self, search_type: str, repos: RepoTable, timestamp: str = None) -> None:
         """Save the search results for a specific search type to an Excel file."""
         if timestamp is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         excel_filename = os.path.join(self.output_dir, f'cursor_{search_type}_{timestamp}.xlsx')
         
-        # Convert dictionary to DataFrame
-        data = []
-        for repo_name, info in sorted(repos_dict.items(), key=lambda x: x[1]['found_by']):
-            row = {'name': repo_name}
-            row.update(info)
-            data.append(row)
-        
-        df = pd.DataFrame(data)
+        df = repos.to_dataframe()
         df.to_excel(excel_filename, index=False)
         
         print(f"\nResults for {search_type} saved to {excel_filename}")
-        print(f"Total unique repositories found by {search_type}: {len(repos_dict)}")
+        print(f"Total unique repositories found by {search_type}: {len(repos)}")
 
-    def search_repositories_by_description(self, query: str, is_current_search: bool = True) -> None:
+    def search_repositories_by_description(self, query: str, is_current_search: bool = True,
+                                           start: date = date(2023, 7, 1), end: date = date(2025, 4, 30)) -> None:
         """Search repositories by description using time-based pagination."""
         url = f"{self.base_url}/search/repositories"
         
-        # 定义时间范围列表
-        time_ranges = [
-            ("2023-07-01", "2023-07-31"),
-            ("2023-08-01", "2023-08-31"),
-            ("2023-09-01", "2023-09-30"),
-            ("2023-10-01", "2023-10-31"),
-            ("2023-11-01", "2023-11-30"),
-            ("2023-12-01", "2023-12-31"),
-            ("2024-01-01", "2024-01-31"),
-            ("2024-02-01", "2024-02-29"),
-            ("2024-03-01", "2024-03-31"),
-            ("2024-04-01", "2024-04-30"),
-            ("2024-05-01", "2024-05-31"),
-            ("2024-06-01", "2024-06-30"),
-            ("2024-07-01", "2024-07-31"),
-            ("2024-08-01", "2024-08-31"),
-            ("2024-09-01", "2024-09-30"),
-            ("2024-10-01", "2024-10-31"),
-            ("2024-11-01", "2024-11-30"),
-            ("2024-12-01", "2024-12-31"),
-            ("2025-01-01", "2025-01-31"),
-            ("2025-02-01", "2025-02-28"),
-            ("2025-03-01", "2025-03-15"),
-            ("2025-03-16", "2025-03-31"),
-            ("2025-04-01", "2025-04-15"),
-            ("2025-04-16", "2025-04-30"),
-        ]
-        
-        # 对每个时间范围进行搜索
-        for start_date, end_date in time_ranges:
-            time_filter = f"created:{start_date}..{end_date}"
-            params = {
-                'q': f"{query} in:description {time_filter}",
-                'per_page': self.per_page,
-                'sort': 'stars',
-                'order': 'desc'
-            }
-            
-            print(f"\nSearching repositories from {start_date} to {end_date}")
-            data = self._make_request(url, params)
-            total_count = data['total_count']
-            
-            for item in data['items']:
-                self._add_repository(item, f"repo_description: {query} ({start_date} to {end_date})", is_current_search)
-            
-            print(f"Found {len(data['items'])} repositories in this time period")
-            print(f"Current unique repositories collected: {len(self.current_search_repos if is_current_search else self.repos)}")
-            
-            # 添加短暂延迟以避免触发速率限制
-            time.sleep(1)
+        # 按月份生成时间范围, 超过1000条结果的范围会被继续二分
+        for start_date, end_date in time_windows(start, end):
+            self._search_time_range(url, query, start_date, end_date, is_current_search)
+
+    def _search_time_range(self, url: str, query: str, start_date: date, end_date: date,
+                           is_current_search: bool) -> None:
+        """Search one creation-date window, halving it while it has more results than the API returns."""
+        time_filter = f"created:{start_date}..{end_date}"
+        params = {
+            'q': f"{query} in:description {time_filter}",
+            'per_page': self.per_page,
+            'sort': 'stars',
+            'order': 'desc'
+        }
+        
+        print(f"\nSearching repositories from {start_date} to {end_date}")
+        can_split = start_date < end_date
+        data = self._make_request(url, params, stop_on_overflow=can_split)
+        
+        if can_split and data['total_count'] > self.max_results:
+            mid_date = start_date + (end_date - start_date) // 2
+            print(f"More than {self.max_results} results, splitting into "
+                  f"{start_date} to {mid_date} and {mid_date + timedelta(days=1)} to {end_date}")
+            self._search_time_range(url, query, start_date, mid_date, is_current_search)
+            self._search_time_range(url, query, mid_date + timedelta(days=1), end_date, is_current_search)
+            return
+        
+        for item in data['items']:
+            self._add_repository(item, f"repo_description: {query} ({start_date} to {end_date})", is_current_search)
+        
+        print(f"Found {len(data['items'])} repositories in this time period")
+        print(f"Current unique repositories collected: {len(self.current_search_repos if is_current_search else self.repos)}")
+        
+        # 添加短暂延迟以避免触发速率限制
+        time.sleep(1)
 
-    def save_results(self) -> None:
+    def save_results(self, timestamp: str = None) -> None:
         """Save all search results to a combined Excel file."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if timestamp is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         excel_filename = os.path.join(self.output_dir, f'cursor_all_repositories_{timestamp}.xlsx')
         
-        # Convert dictionary to DataFrame
-        data = []
-        for repo_name, info in sorted(self.repos.items(), key=lambda x: x[1]['found_by']):
-            row = {'name': repo_name}
-            row.update(info)
-            data.append(row)
-        
-        df = pd.DataFrame(data)
+        df = self.repos.to_dataframe()
         df.to_excel(excel_filename, index=False)
         
         print(f"\nAll results saved to {excel_filename}")
         print(f"Total unique repositories found: {len(self.repos)}")
 
 def main():
-    # Get GitHub token from environment variable
-    token = os.getenv('GITHUB_TOKEN')
-    if not token:
-        print("Error: GITHUB_TOKEN environment variable is not set")
-        print("Please set your GitHub token as an environment variable:")
-        print("export GITHUB_TOKEN='your_token_here'")
+    # Get GitHub tokens from environment variables (GITHUB_TOKENS is comma-separated)
+    tokens = [token.strip() for token in os.getenv('GITHUB_TOKENS', '').split(',') if token.strip()]
+    if not tokens and os.getenv('GITHUB_TOKEN'):
+        tokens = [os.getenv('GITHUB_TOKEN')]
+    if not tokens:
+        print("Error: GITHUB_TOKENS / GITHUB_TOKEN environment variable is not set")
+        print("Please set your GitHub token(s) as an environment variable:")
+        print("export GITHUB_TOKENS='token_one,token_two'")
         return
     
-    # Initialize GitHub search
-    searcher = GitHubSearch(token)
+    # Initialize GitHub search; all output files of this run share one timestamp
+    searcher = GitHubSearch(tokens)
+    run_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     
     print("Starting search for Cursor-related repositories...")
     
@@ -217,7 +294,7 @@ def main():
     searcher.search_repositories_by_description("Cursor")
     
     # Save all results
-    searcher.save_results()
+    searcher.save_results(run_timestamp)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
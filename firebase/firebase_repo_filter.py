@@ -211,9 +211,8 @@ def filter_csv_by_keywords():
             return False
         return any(keyword.lower() in str(text).lower() for keyword in exclusion_keywords)
     
-    # Filter the dataframe - first include records with keywords, then exclude records with exclusion keywords
-    filtered_df = df[df[description_col].apply(contains_keyword)]
-    filtered_df = filtered_df[~filtered_df[description_col].apply(contains_exclusion_keyword)]
+    # Filter the dataframe in a single pass - keep records with keywords and without exclusion keywords
+    filtered_df = df[df[description_col].apply(lambda text: contains_keyword(text) and not contains_exclusion_keyword(text))]
     
     # Get GitHub token from environment variable
     github_token = os.environ.get('GITHUB_TOKEN')
@@ -1,110 +1,177 @@
-import requests
+import aiohttp
+import asyncio
+import math
 import os
+import random
 import time
 from datetime import datetime
-from typing import Dict
+from operator import itemgetter
+from typing import Dict, List
 import pandas as pd
 
+class RateLimiter:
+    """Pace concurrent GitHub requests from the X-RateLimit-* headers of each response."""
+    def __init__(self, max_concurrency: int = 10):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.resume = asyncio.Event()  # 额度用尽时清除, 到重置时间后再设置
+        self.resume.set()
+        self.remaining = None  # None表示额度未知或已重置
+        self.reset_at = 0
+        self.in_flight = 0  # 已放行但尚未结束的请求数
+
+    async def __aenter__(self):
+        # Take a slot first so the quota is checked and reserved by the request that actually goes out
+        await self.semaphore.acquire()
+        while True:
+            if not self.resume.is_set():
+                # Give the slot back while paused so it is not held through the whole reset window
+                self.semaphore.release()
+                await self.resume.wait()
+                await self.semaphore.acquire()
+                continue
+            if self.remaining is None or self.remaining > 0:
+                break
+            self._pause_until(self.reset_at)
+        if self.remaining is not None:
+            self.remaining -= 1  # 为本次请求预留额度, 响应头到达后再校正
+        self.in_flight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.in_flight -= 1
+        self.semaphore.release()
+
+    def update(self, headers) -> None:
+        """Refresh the remaining quota and reset time from a response's headers."""
+        if 'X-RateLimit-Remaining' not in headers:
+            return
+        reset_at = int(headers.get('X-RateLimit-Reset', 0))
+        # The server's count does not include the other requests still in flight, so hold those back too
+        remaining = int(headers['X-RateLimit-Remaining']) - (self.in_flight - 1)
+        if self.remaining is None or reset_at > self.reset_at:
+            self.remaining = remaining
+        else:
+            # A late response must not raise the quota above what is still reserved
+            self.remaining = min(self.remaining, remaining)
+        self.reset_at = max(self.reset_at, reset_at)
+
+    def _pause_until(self, reset_at: int) -> None:
+        """Block new requests until the rate limit window resets."""
+        # Keep a safety margin past the reset time in case the local clock runs ahead of GitHub's
+        delay = reset_at - time.time() + 10
+        if delay <= 0:
+            self.remaining = None
+            return
+        if not self.resume.is_set():
+            return
+        
+        def resume():
+            self.remaining = None
+            self.resume.set()
+        
+        print(f"\nRate limit reached. Waiting {int(delay)} seconds...")
+        self.resume.clear()
+        asyncio.get_running_loop().call_later(delay, resume)
+
 class GitHubSearch:
-    def __init__(self, token: str):
+    def __init__(self, token: str, max_concurrency: int = 10):
         self.token = token
         self.headers = {
             'Authorization': f'token {token}',
             'Accept': 'application/vnd.github.v3+json'
         }
         self.base_url = "https://api.github.com"
-        self.repos: Dict[str, Dict] = {}  # 存储所有搜索结果
+        self.repos: Dict[str, Dict] = {}  # 存储所有搜索结果, found_by为标签集合
         self.current_search_repos: Dict[str, Dict] = {}  # 存储当前搜索循环的结果
         self.per_page = 100
         self.max_results = 1000
+        self.max_concurrency = max_concurrency
+        self.limiter = None  # 在事件循环内创建, 按响应头中的速率限制额度控制并发和节奏
         # 确保firebase文件夹存在
         self.output_dir = os.path.dirname(os.path.abspath(__file__))
         os.makedirs(self.output_dir, exist_ok=True)
 
-    def _check_rate_limit(self, response) -> bool:
-        """Check GitHub API rate limit and wait if necessary."""
-        rate_limit_remaining = int(response.headers.get('X-RateLimit-Remaining', 0))
-        rate_limit_reset = int(response.headers.get('X-RateLimit-Reset', 0))
-        
-        if rate_limit_remaining <= 1:
-            wait_time = max(rate_limit_reset - int(time.time()), 0) + 10
-            print(f"\nRate limit reached. Waiting {wait_time} seconds...")
-            time.sleep(wait_time)
-            return True
-        return False
-
-    def _make_request(self, url: str, params: Dict) -> Dict:
-        """Make a request with rate limit handling and pagination."""
-        all_items = []
-        total_count = 0
-        page = 1
-        
+    async def _fetch_page(self, session: aiohttp.ClientSession, url: str, params: Dict, page: int) -> Dict:
+        """Fetch one page of search results, backing off on rate limit responses."""
+        attempt = 0
         while True:
             try:
-                # Add page parameter
-                params['page'] = page
-                response = requests.get(url, headers=self.headers, params=params)
-                response.raise_for_status()
-                
-                if not self._check_rate_limit(response):
-                    data = response.json()
-                    if page == 1:
-                        total_count = data['total_count']
-                        print(f"Total repositories found: {total_count} repositories with query: {url}")
-                    
-                    items = data['items']
-                    if not items:  # No more items
-                        break
-                        
-                    all_items.extend(items)
-                    print(f"Fetched page {page}, total items: {len(all_items)}")
-                    
-                    # Check if we've fetched all items or reached the maximum
-                    if len(all_items) >= min(total_count, self.max_results):
-                        break
-                        
-                    page += 1
-                    # Add a small delay between pages to avoid rate limiting
-                    time.sleep(1)
-                    
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 403:
-                    wait_time = max(int(e.response.headers.get('X-RateLimit-Reset', 0)) - int(time.time()), 0) + 10
-                    print(f"Rate limit reached. Waiting {wait_time} seconds...")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    print(f"HTTP error occurred: {e}")
-                    break
-            except requests.exceptions.RequestException as e:
+                async with self.limiter:
+                    async with session.get(url, params={**params, 'page': page}) as response:
+                        self.limiter.update(response.headers)
+                        if response.status not in (403, 429):
+                            response.raise_for_status()
+                            return await response.json()
+                        retry_after = response.headers.get('Retry-After')
+                        exhausted = response.headers.get('X-RateLimit-Remaining') == '0'
+            except aiohttp.ClientResponseError as e:
+                print(f"HTTP error occurred: {e}")
+                return None
+            except aiohttp.ClientError as e:
                 print(f"Request error occurred: {e}")
-                break
+                return None
+            
+            if exhausted and not retry_after:
+                # The limiter has seen remaining=0 and holds the next attempt until the reset
+                continue
+            if attempt >= 6:
+                print(f"Giving up on page {page} after {attempt} rate limit retries")
+                return None
+            # Secondary rate limit: honour Retry-After, otherwise back off exponentially with jitter
+            wait_time = int(retry_after) if retry_after else min(2 ** attempt, 60) + random.random()
+            print(f"Secondary rate limit hit. Retrying page {page} in {wait_time:.1f} seconds...")
+            await asyncio.sleep(wait_time)
+            attempt += 1
+
+    async def _make_request(self, session: aiohttp.ClientSession, url: str, params: Dict) -> Dict:
+        """Make a request with rate limit handling and concurrent pagination."""
+        data = await self._fetch_page(session, url, params, 1)
+        if not data:
+            return {'items': [], 'total_count': 0}
+        
+        total_count = data['total_count']
+        print(f"Total repositories found: {total_count} repositories with query: {params['q']}")
+        
+        # Page 1 tells us how many pages exist, so the rest can be fetched at once
+        last_page = math.ceil(min(total_count, self.max_results) / self.per_page)
+        pages = await asyncio.gather(*(self._fetch_page(session, url, params, page)
+                                       for page in range(2, last_page + 1)))
+        
+        all_items = list(data['items'])
+        for page_data in pages:
+            if page_data:
+                all_items.extend(page_data['items'])
+        print(f"Fetched {last_page} pages, total items: {len(all_items)}")
         
         return {'items': all_items, 'total_count': total_count}
 
     def _add_repository(self, repo_data: Dict, found_by: str, is_current_search: bool = True) -> None:
         """Add a repository to the results or update its found_by information."""
         repo_name = repo_data['full_name']
-        repo_info = {
-            'url': repo_data['html_url'],
-            'description': repo_data.get('description', 'No description'),
-            'found_by': found_by
-        }
+        url = repo_data['html_url']
+        description = repo_data.get('description', 'No description')
 
+        # found_by is a set, so the saved label does not depend on the order concurrent searches finish in
         # Add to current search results
         if is_current_search:
             if repo_name not in self.current_search_repos:
-                self.current_search_repos[repo_name] = repo_info
+                self.current_search_repos[repo_name] = {'url': url, 'description': description, 'found_by': {found_by}}
             else:
-                if found_by not in self.current_search_repos[repo_name]['found_by']:
-                    self.current_search_repos[repo_name]['found_by'] += f", {found_by}"
+                self.current_search_repos[repo_name]['found_by'].add(found_by)
 
         # Add to all results
         if repo_name not in self.repos:
-            self.repos[repo_name] = repo_info
+            self.repos[repo_name] = {'url': url, 'description': description, 'found_by': {found_by}}
         else:
-            if found_by not in self.repos[repo_name]['found_by']:
-                self.repos[repo_name]['found_by'] += f", {found_by}"
+            self.repos[repo_name]['found_by'].add(found_by)
+
+    @staticmethod
+    def _to_dataframe(repos_dict: Dict[str, Dict]) -> pd.DataFrame:
+        """Build the result DataFrame with found_by labels joined in sorted order, sorted by found_by."""
+        rows = [(repo_name, info['url'], info['description'], ", ".join(sorted(info['found_by'])))
+                for repo_name, info in repos_dict.items()]
+        rows.sort(key=itemgetter(3, 0))
+        return pd.DataFrame(rows, columns=['name', 'url', 'description', 'found_by'])
 
     def _save_search_results(self, search_type: str, repos_dict: Dict[str, Dict], timestamp: str = None) -> None:
         """Save the search results for a specific search type to an Excel file."""
@@ -113,21 +180,15 @@ class GitHubSearch:
         
         excel_filename = os.path.join(self.output_dir, f'firebase_{search_type}_{timestamp}.xlsx')
         
-        # Convert dictionary to DataFrame
-        data = []
-        for repo_name, info in sorted(repos_dict.items(), key=lambda x: x[1]['found_by']):
-            row = {'name': repo_name}
-            row.update(info)
-            data.append(row)
-        
-        df = pd.DataFrame(data)
+        df = self._to_dataframe(repos_dict)
         df.to_excel(excel_filename, index=False)
         
         print(f"\nResults for {search_type} saved to {excel_filename}")
         print(f"Total unique repositories found by {search_type}: {len(repos_dict)}")
 
-    def search_repositories_by_description(self, query: str, is_current_search: bool = True) -> None:
-        """Search repositories by description using time-based pagination."""
+    async def search_repositories_by_description(self, session: aiohttp.ClientSession, query: str,
+                                                 is_current_search: bool = True) -> None:
+        """Search repositories by description, querying all time ranges concurrently."""
         url = f"{self.base_url}/search/repositories"
         
         # 定义时间范围列表
@@ -158,42 +219,43 @@ class GitHubSearch:
             ("2025-04-16", "2025-04-30"),
         ]
         
-        # 对每个时间范围进行搜索
-        for start_date, end_date in time_ranges:
-            time_filter = f"created:{start_date}..{end_date}"
-            params = {
-                'q': f"{query} in:description {time_filter}",
-                'per_page': self.per_page,
-                'sort': 'stars',
-                'order': 'desc'
-            }
-            
-            print(f"\nSearching repositories from {start_date} to {end_date}")
-            data = self._make_request(url, params)
-            total_count = data['total_count']
-            
-            for item in data['items']:
-                self._add_repository(item, f"repo_description: {query} ({start_date} to {end_date})", is_current_search)
-            
-            print(f"Found {len(data['items'])} repositories in this time period")
-            print(f"Current unique repositories collected: {len(self.current_search_repos if is_current_search else self.repos)}")
-            
-            # 添加短暂延迟以避免触发速率限制
-            time.sleep(1)
+        # 所有时间范围并发搜索
+        await asyncio.gather(*(self._search_time_range(session, url, query, start_date, end_date, is_current_search)
+                               for start_date, end_date in time_ranges))
+
+    async def _search_time_range(self, session: aiohttp.ClientSession, url: str, query: str,
+                                 start_date: str, end_date: str, is_current_search: bool) -> None:
+        """Search a single creation-date window and collect its repositories."""
+        time_filter = f"created:{start_date}..{end_date}"
+        params = {
+            'q': f"{query} in:description {time_filter}",
+            'per_page': self.per_page,
+            'sort': 'stars',
+            'order': 'desc'
+        }
+        
+        print(f"\nSearching repositories from {start_date} to {end_date}")
+        data = await self._make_request(session, url, params)
+        
+        for item in data['items']:
+            self._add_repository(item, f"repo_description: {query} ({start_date} to {end_date})", is_current_search)
+        
+        print(f"Found {len(data['items'])} repositories in this time period ({start_date} to {end_date})")
+        print(f"Current unique repositories collected: {len(self.current_search_repos if is_current_search else self.repos)}")
+
+    async def run_all(self, keywords: List[str]) -> None:
+        """Run the description search for every keyword over one shared HTTP session."""
+        self.limiter = RateLimiter(self.max_concurrency)
+        async with aiohttp.ClientSession(headers=self.headers) as session:
+            await asyncio.gather(*(self.search_repositories_by_description(session, keyword)
+                                   for keyword in keywords))
 
     def save_results(self) -> None:
         """Save all search results to a combined Excel file."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         excel_filename = os.path.join(self.output_dir, f'firebase_all_repositories_{timestamp}.xlsx')
         
-        # Convert dictionary to DataFrame
-        data = []
-        for repo_name, info in sorted(self.repos.items(), key=lambda x: x[1]['found_by']):
-            row = {'name': repo_name}
-            row.update(info)
-            data.append(row)
-        
-        df = pd.DataFrame(data)
+        df = self._to_dataframe(self.repos)
         df.to_excel(excel_filename, index=False)
         
         print(f"\nAll results saved to {excel_filename}")
@@ -217,9 +279,8 @@ def main():
     keywords = [
         "Firebase", "Project IDX", "Project.IDX"
     ]
-    for keyword in keywords:
-        print(f"\nSearching for repositories with keyword: {keyword}")
-        searcher.search_repositories_by_description(keyword)
+    print(f"\nSearching for repositories with keywords: {', '.join(keywords)}")
+    asyncio.run(searcher.run_all(keywords))
     
     # Save all results
     searcher.save_results()
@@ -1,132 +1,250 @@
-import requests
+import aiohttp
+import asyncio
+import json
+import math
 import os
+import pickle
+import sys
 import time
-from datetime import datetime
-from typing import Dict
-import pandas as pd
+from datetime import date, datetime, timedelta
+from operator import itemgetter
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    json_loads = json.loads
+
+try:
+    import xlsxwriter
+except ImportError:  # xlsxwriter is optional; fall back to openpyxl's write-only mode
+    xlsxwriter = None
+
+# 结果文件的列
+COLUMNS = ('name', 'url', 'description', 'found_by')
+
+# 支持的结果文件格式
+OUTPUT_FORMATS = ('xlsx', 'parquet')
+
+class TokenBucket:
+    """Token bucket that spaces requests on the event loop to a fixed per-minute budget."""
+    def __init__(self, per_minute: int):
+        self.capacity = per_minute
+        self.tokens = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        """Take one token, sleeping only as long as needed for it to refill."""
+        while True:
+            # No await between the refill and the decrement, so coroutines cannot interleave here
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
 
 class GitHubSearch:
-    def __init__(self, token: str):
+    def __init__(self, token: str, output_format: str = 'xlsx'):
         self.token = token
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format {output_format!r}; expected one of: {', '.join(OUTPUT_FORMATS)}")
+        self.output_format = output_format  # 'xlsx' 或 'parquet'
         self.headers = {
             'Authorization': f'token {token}',
             'Accept': 'application/vnd.github.v3+json'
         }
         self.base_url = "https://api.github.com"
-        self.repos: Dict[str, Dict] = {}  # 存储所有搜索结果
-        self.current_search_repos: Dict[str, Dict] = {}  # 存储当前搜索循环的结果
+        self.max_connections = 20  # 所有时间范围和分页共用的连接池大小
+        self.max_retries = 5  # 网关类错误(502/503/504)的重试次数
+        self.limiter = TokenBucket(per_minute=30)  # 搜索API每分钟30次请求
+        self.repos: Dict[str, Dict] = {}  # 存储所有搜索结果, found_by为标签集合
+        self._changes = 0  # 每次添加仓库时递增, 用于判断已排序的结果行是否过期
+        self._repos_rows: Optional[Tuple[int, List[Tuple[str, str, str, str]]]] = None  # self.repos的已排序结果行
+        self._timestamp = None  # 首次保存时生成, 同一次运行的所有结果文件共用
         self.per_page = 100
         self.max_results = 1000
         # 确保trae文件夹存在
         self.output_dir = os.path.dirname(os.path.abspath(__file__))
         os.makedirs(self.output_dir, exist_ok=True)
+        # 按(url, 参数)缓存ETag和对应页面, 未变化的页面返回304且不消耗速率限制额度
+        self.etag_cache_path = os.path.join(self.output_dir, 'trae_etag_cache.pkl')
+        self.etag_cache: Dict[Tuple, Dict] = {}
+        if os.path.exists(self.etag_cache_path):
+            with open(self.etag_cache_path, 'rb') as f:
+                self.etag_cache = pickle.load(f)
 
-    def _check_rate_limit(self, response) -> bool:
+    async def _check_rate_limit(self, headers) -> bool:
         """Check GitHub API rate limit and wait if necessary."""
-        rate_limit_remaining = int(response.headers.get('X-RateLimit-Remaining', 0))
-        rate_limit_reset = int(response.headers.get('X-RateLimit-Reset', 0))
+        if 'X-RateLimit-Remaining' not in headers:
+            return False
+        rate_limit_remaining = int(headers['X-RateLimit-Remaining'])
+        rate_limit_reset = int(headers.get('X-RateLimit-Reset', 0))
         
         if rate_limit_remaining <= 1:
             wait_time = max(rate_limit_reset - int(time.time()), 0) + 10
             print(f"\nRate limit reached. Waiting {wait_time} seconds...")
-            time.sleep(wait_time)
+            await asyncio.sleep(wait_time)
             return True
         return False
 
-    def _make_request(self, url: str, params: Dict) -> Dict:
-        """Make a request with rate limit handling and pagination."""
-        all_items = []
-        total_count = 0
-        page = 1
+    async def _conditional_get(self, session: aiohttp.ClientSession, url: str, params: Dict) -> Tuple[Dict, Dict]:
+        """GET a page, revalidating a previously cached copy with its ETag."""
+        cache_key = (url, tuple(sorted(params.items())))
+        cached = self.etag_cache.get(cache_key)
+        headers = {'If-None-Match': cached['etag']} if cached else {}
         
+        await self.limiter.acquire()
+        async with session.get(url, params=params, headers=headers) as response:
+            response.raise_for_status()
+            if response.status == 304:
+                return response.headers, cached['data']
+            
+            # Hand orjson the raw body bytes rather than a decoded str
+            payload = json_loads(await response.read())
+            # Keep only (full_name, html_url, description) per item and let the full repository dicts go
+            data = {
+                'total_count': payload['total_count'],
+                'items': [(item['full_name'], item['html_url'], item.get('description', 'No description'))
+                          for item in payload['items']]
+            }
+            del payload
+            if 'ETag' in response.headers:
+                self.etag_cache[cache_key] = {'etag': response.headers['ETag'], 'data': data}
+            return response.headers, data
+
+    def _save_etag_cache(self) -> None:
+        """Persist the ETag cache for the next run."""
+        with open(self.etag_cache_path, 'wb') as f:
+            pickle.dump(self.etag_cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    async def _fetch_page(self, session: aiohttp.ClientSession, url: str, params: Dict, page: int) -> Optional[Dict]:
+        """Fetch one page of search results, waiting out rate limit responses and retrying gateway errors."""
+        retries = 0
         while True:
             try:
-                # Add page parameter
-                params['page'] = page
-                response = requests.get(url, headers=self.headers, params=params)
-                response.raise_for_status()
-                
-                if not self._check_rate_limit(response):
-                    data = response.json()
-                    if page == 1:
-                        total_count = data['total_count']
-                        print(f"Total repositories found: {total_count} repositories with query: {url}")
-                    
-                    items = data['items']
-                    if not items:  # No more items
-                        break
-                        
-                    all_items.extend(items)
-                    print(f"Fetched page {page}, total items: {len(all_items)}")
-                    
-                    # Check if we've fetched all items or reached the maximum
-                    if len(all_items) >= min(total_count, self.max_results):
-                        break
-                        
-                    page += 1
-                    # Add a small delay between pages to avoid rate limiting
-                    time.sleep(1)
-                    
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 403:
-                    wait_time = max(int(e.response.headers.get('X-RateLimit-Reset', 0)) - int(time.time()), 0) + 10
+                headers, data = await self._conditional_get(session, url, {**params, 'page': page})
+                # The page is valid even when it used up the quota; only the next request has to wait
+                await self._check_rate_limit(headers)
+                return data
+            except aiohttp.ClientResponseError as e:
+                if e.status == 403:
+                    reset = int((e.headers or {}).get('X-RateLimit-Reset', 0))
+                    wait_time = max(reset - int(time.time()), 0) + 10
                     print(f"Rate limit reached. Waiting {wait_time} seconds...")
-                    time.sleep(wait_time)
+                    await asyncio.sleep(wait_time)
                     continue
-                else:
-                    print(f"HTTP error occurred: {e}")
-                    break
-            except requests.exceptions.RequestException as e:
+                if e.status in (502, 503, 504) and retries < self.max_retries:
+                    await asyncio.sleep(0.5 * 2 ** retries)
+                    retries += 1
+                    continue
+                print(f"HTTP error occurred: {e}")
+                return None
+            except aiohttp.ClientError as e:
                 print(f"Request error occurred: {e}")
-                break
+                return None
+
+    async def _make_request(self, session: aiohttp.ClientSession, url: str, params: Dict,
+                            first_page: Optional[Dict] = None) -> Dict:
+        """Make a request with rate limit handling, fetching pages 2..N concurrently once page 1 is known.
+
+        A first_page already fetched by the caller is used as page 1 instead of requesting it again.
+        """
+        data = first_page or await self._fetch_page(session, url, params, 1)
+        if not data:
+            return {'items': [], 'total_count': 0}
+        
+        total_count = data['total_count']
+        print(f"Total repositories found: {total_count} repositories with query: {url}")
+        
+        # Search results are capped at max_results, so the page count is known after the first page
+        last_page = math.ceil(min(total_count, self.max_results) / self.per_page)
+        pages = await asyncio.gather(*(self._fetch_page(session, url, params, page)
+                                       for page in range(2, last_page + 1)))
+        # Size the result list once from total_count and fill it page by page, trimming any shortfall
+        all_items = [None] * max(min(total_count, self.max_results), len(data['items']))
+        filled = 0
+        for page_data in [data, *pages]:
+            if page_data:
+                items = page_data['items']
+                all_items[filled:filled + len(items)] = items
+                filled += len(items)
+        del all_items[filled:]
+        print(f"Fetched {max(last_page, 1)} pages, total items: {len(all_items)}")
         
         return {'items': all_items, 'total_count': total_count}
 
-    def _add_repository(self, repo_data: Dict, found_by: str, is_current_search: bool = True) -> None:
-        """Add a repository to the results or update its found_by information."""
-        repo_name = repo_data['full_name']
-        repo_info = {
-            'url': repo_data['html_url'],
-            'description': repo_data.get('description', 'No description'),
-            'found_by': found_by
-        }
+    def _add_repository(self, repo: Tuple[str, str, str], found_by: str) -> None:
+        """Add a (full_name, html_url, description) repository or update its found_by information."""
+        repo_name, url, description = repo
+        self._changes += 1
 
-        # Add to current search results
-        if is_current_search:
-            if repo_name not in self.current_search_repos:
-                self.current_search_repos[repo_name] = repo_info
-            else:
-                if found_by not in self.current_search_repos[repo_name]['found_by']:
-                    self.current_search_repos[repo_name]['found_by'] += f", {found_by}"
-
-        # Add to all results
-        if repo_name not in self.repos:
-            self.repos[repo_name] = repo_info
+        entry = self.repos.get(repo_name)
+        if entry is None:
+            self.repos[repo_name] = {'url': url, 'description': description, 'found_by': {found_by}}
         else:
-            if found_by not in self.repos[repo_name]['found_by']:
-                self.repos[repo_name]['found_by'] += f", {found_by}"
+            entry['found_by'].add(found_by)
 
-    def _save_search_results(self, search_type: str, repos_dict: Dict[str, Dict], timestamp: str = None) -> None:
-        """Save the search results for a specific search type to an Excel file."""
-        if timestamp is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        excel_filename = os.path.join(self.output_dir, f'trae_{search_type}_{timestamp}.xlsx')
-        
-        # Convert dictionary to DataFrame
-        data = []
-        for repo_name, info in sorted(repos_dict.items(), key=lambda x: x[1]['found_by']):
-            row = {'name': repo_name}
-            row.update(info)
-            data.append(row)
+    def _sorted_rows(self, repos_dict: Dict[str, Dict]) -> List[Tuple[str, str, str, str]]:
+        """Build (name, url, description, found_by) rows sorted by found_by."""
+        # Saving self.repos again without new additions reuses the rows built last time instead of re-sorting
+        is_repos = repos_dict is self.repos
+        if is_repos and self._repos_rows is not None and self._repos_rows[0] == self._changes:
+            return self._repos_rows[1]
         
-        df = pd.DataFrame(data)
-        df.to_excel(excel_filename, index=False)
+        rows = [(repo_name, info['url'], info['description'], ", ".join(sorted(info['found_by'])))
+                for repo_name, info in repos_dict.items()]
+        rows.sort(key=itemgetter(3))
+        if is_repos:
+            self._repos_rows = (self._changes, rows)
+        return rows
+
+    def _build_path(self, prefix: str, timestamp: str = None) -> str:
+        """Join the output path for a result file, stamped with the run's timestamp by default."""
+        if timestamp is None:
+            if self._timestamp is None:
+                self._timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = self._timestamp
+        return os.path.join(self.output_dir, f'trae_{prefix}_{timestamp}.{self.output_format}')
+
+    def _write(self, rows: List[Tuple[str, str, str, str]], filename: str) -> None:
+        """Write the rows in the configured output format; only Parquet goes through pandas."""
+        # pandas and openpyxl are imported only when writing, so searching and early exits skip their import cost
+        if self.output_format == 'parquet':
+            import pandas as pd
+            columns = list(zip(*rows)) or [()] * len(COLUMNS)
+            df = pd.DataFrame({name: list(values) for name, values in zip(COLUMNS, columns)}, copy=False)
+            df.to_parquet(filename, compression='zstd', index=False)
+        elif xlsxwriter is not None:
+            # constant_memory streams rows to disk instead of holding the whole workbook
+            workbook = xlsxwriter.Workbook(filename, {'constant_memory': True})
+            worksheet = workbook.add_worksheet()
+            worksheet.write_row(0, 0, COLUMNS)
+            for row_index, row in enumerate(rows, start=1):
+                worksheet.write_row(row_index, 0, row)
+            workbook.close()
+        else:
+            # write_only workbooks stream rows the same way
+            import openpyxl
+            workbook = openpyxl.Workbook(write_only=True)
+            worksheet = workbook.create_sheet()
+            worksheet.append(COLUMNS)
+            for row in rows:
+                worksheet.append(row)
+            workbook.save(filename)
+
+    def _save_search_results(self, search_type: str, repos_dict: Dict[str, Dict], timestamp: str = None) -> None:
+        """Save the search results for a specific search type to an Excel or Parquet file."""
+        output_file = self._build_path(search_type, timestamp)
+        self._write(self._sorted_rows(repos_dict), output_file)
         
-        print(f"\nResults for {search_type} saved to {excel_filename}")
+        print(f"\nResults for {search_type} saved to {output_file}")
         print(f"Total unique repositories found by {search_type}: {len(repos_dict)}")
 
-    def search_repositories_by_description(self, query: str, is_current_search: bool = True) -> None:
+    def search_repositories_by_description(self, query: str) -> None:
         """Search repositories by description using time-based pagination."""
         url = f"{self.base_url}/search/repositories"
         
@@ -142,45 +260,75 @@ class GitHubSearch:
             ("2025-04-16", "2025-04-30"),
         ]
         
-        # 对每个时间范围进行搜索
-        for start_date, end_date in time_ranges:
-            time_filter = f"created:{start_date}..{end_date}"
-            params = {
-                'q': f"{query} in:description {time_filter}",
-                'per_page': self.per_page,
-                'sort': 'stars',
-                'order': 'desc'
-            }
-            
-            print(f"\nSearching repositories from {start_date} to {end_date}")
-            data = self._make_request(url, params)
-            total_count = data['total_count']
-            
-            for item in data['items']:
-                self._add_repository(item, f"repo_description: {query} ({start_date} to {end_date})", is_current_search)
+        # 超过1000条结果的时间范围会被继续二分, 每个子范围单独搜索
+        # 查询中不变的部分只拼接一次, 每个时间范围只追加时间过滤条件
+        query_prefix = f"{query} in:description "
+        results = asyncio.run(self._search_time_ranges(url, query_prefix, time_ranges))
+        for (start_date, end_date), items in results:
+            # 每个时间范围只生成一次标签, 所有仓库共享同一个字符串对象
+            found_by = sys.intern(f"repo_description: {query} ({start_date} to {end_date})")
+            for item in items:
+                self._add_repository(item, found_by)
             
-            print(f"Found {len(data['items'])} repositories in this time period")
-            print(f"Current unique repositories collected: {len(self.current_search_repos if is_current_search else self.repos)}")
-            
-            # 添加短暂延迟以避免触发速率限制
-            time.sleep(1)
-
-    def save_results(self) -> None:
-        """Save all search results to a combined Excel file."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        excel_filename = os.path.join(self.output_dir, f'trae_all_repositories_{timestamp}.xlsx')
+            print(f"Found {len(items)} repositories in this time period ({start_date} to {end_date})")
+            print(f"Current unique repositories collected: {len(self.repos)}")
         
-        # Convert dictionary to DataFrame
-        data = []
-        for repo_name, info in sorted(self.repos.items(), key=lambda x: x[1]['found_by']):
-            row = {'name': repo_name}
-            row.update(info)
-            data.append(row)
+        self._save_etag_cache()
+
+    def _search_params(self, query_prefix: str, start_date: str, end_date: str) -> Dict:
+        """Build the search parameters for one creation-date window."""
+        return {
+            'q': query_prefix + "created:" + start_date + ".." + end_date,
+            'per_page': self.per_page,
+            'sort': 'stars',
+            'order': 'desc'
+        }
+
+    async def _search_time_ranges(self, url: str, query_prefix: str, time_ranges: List[Tuple[str, str]]
+                                  ) -> List[Tuple[Tuple[str, str], List[Tuple[str, str, str]]]]:
+        """Search all date windows concurrently over one pooled session, refining crowded windows first."""
+        connector = aiohttp.TCPConnector(limit=self.max_connections)
+        async with aiohttp.ClientSession(headers=self.headers, connector=connector) as session:
+            refined = await asyncio.gather(*(self._adaptive_time_ranges(session, url, query_prefix, start_date, end_date)
+                                             for start_date, end_date in time_ranges))
+            windows = [window for windows in refined for window in windows]
+            results = await asyncio.gather(*(self._search_time_range(session, url, query_prefix,
+                                                                     start_date, end_date, first_page)
+                                             for start_date, end_date, first_page in windows))
+            return [((start_date, end_date), items) for (start_date, end_date, _), items in zip(windows, results)]
+
+    async def _adaptive_time_ranges(self, session: aiohttp.ClientSession, url: str, query_prefix: str,
+                                    start_date: str, end_date: str) -> List[Tuple[str, str, Optional[Dict]]]:
+        """Halve a date window until every part has no more results than the API returns.
+
+        Each resulting window carries its probe, which is page 1 of the real search.
+        """
+        data = await self._fetch_page(session, url, self._search_params(query_prefix, start_date, end_date), 1)
+        start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+        if not data or data['total_count'] <= self.max_results or start >= end:
+            return [(start_date, end_date, data)]
         
-        df = pd.DataFrame(data)
-        df.to_excel(excel_filename, index=False)
+        mid = start + (end - start) // 2
+        print(f"More than {self.max_results} results from {start_date} to {end_date}, splitting at {mid}")
+        halves = await asyncio.gather(
+            self._adaptive_time_ranges(session, url, query_prefix, start_date, mid.isoformat()),
+            self._adaptive_time_ranges(session, url, query_prefix, (mid + timedelta(days=1)).isoformat(), end_date))
+        return halves[0] + halves[1]
+
+    async def _search_time_range(self, session: aiohttp.ClientSession, url: str, query_prefix: str,
+                                 start_date: str, end_date: str,
+                                 first_page: Optional[Dict] = None) -> List[Tuple[str, str, str]]:
+        """Fetch all repositories created within a single date window."""
+        print(f"\nSearching repositories from {start_date} to {end_date}")
+        params = self._search_params(query_prefix, start_date, end_date)
+        return (await self._make_request(session, url, params, first_page))['items']
+
+    def save_results(self) -> None:
+        """Save all search results to a combined Excel or Parquet file."""
+        output_file = self._build_path('all_repositories')
+        self._write(self._sorted_rows(self.repos), output_file)
         
-        print(f"\nAll results saved to {excel_filename}")
+        print(f"\nAll results saved to {output_file}")
         print(f"Total unique repositories found: {len(self.repos)}")
 
 def main():
@@ -193,7 +341,12 @@ def main():
         return
     
     # Initialize GitHub search
-    searcher = GitHubSearch(token)
+    try:
+        searcher = GitHubSearch(token, output_format=os.getenv('TRAE_OUTPUT_FORMAT', 'xlsx'))
+    except ValueError as e:
+        print(f"Error: {e}")
+        print("Set TRAE_OUTPUT_FORMAT to 'xlsx' or 'parquet', or leave it unset for xlsx")
+        return
     
     print("Starting search for Trae-related repositories...")
     
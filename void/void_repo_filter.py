@@ -1,14 +1,90 @@
+import numpy as np
 import pandas as pd
 import os
+import re
 import glob
 import csv
-import requests
-from tqdm import tqdm
+import json
+import math
+import sqlite3
 import time
+import asyncio
+import aiohttp
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from itertools import repeat
+from tqdm.asyncio import tqdm_asyncio
+from void_repo_search_excel import RateLimiter, json_loads
 
-def get_github_stats(repo_url, github_token=None):
+try:
+    from aiohttp_client_cache import CachedSession, SQLiteBackend
+except ImportError:  # aiohttp-client-cache is optional; without it every run hits the API
+    CachedSession = None
+
+# Cached GitHub responses live next to the script and expire after a day; the REST cache needs the optional
+# aiohttp-client-cache package, while parsed GraphQL stats are cached per repository with the stdlib sqlite3
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "void_github_cache.sqlite")
+STATS_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "void_graphql_github_cache.sqlite")
+CACHE_EXPIRE_SECONDS = 86400
+
+# Above this many rows the keyword filter is split across worker processes
+PARALLEL_FILTER_MIN_ROWS = 50_000
+
+# With per_page=1 the page number of the rel="last" link equals the commit count
+LAST_PAGE_RE = re.compile(r'<[^>]*[?&]page=(\d+)[^>]*>;\s*rel="last"')
+
+# GraphQL lets one request cover many repositories through aliased fields
+GRAPHQL_URL = "https://api.github.com/graphql"
+GRAPHQL_BATCH_SIZE = 40
+GRAPHQL_REPO_FIELDS = "stargazerCount diskUsage defaultBranchRef { target { ... on Commit { history { totalCount } } } }"
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is optional; fall back to the regex scan
+    ahocorasick = None
+
+def build_keyword_automaton(keywords, exclusion_keywords):
     """
-    Get repository statistics from GitHub API
+    Build one Aho-Corasick automaton tagging every lowercased keyword as 'inc' or 'exc'
+    """
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword.lower(), 'inc')
+    # Exclusion tags win for words present in both lists
+    for keyword in exclusion_keywords:
+        automaton.add_word(keyword.lower(), 'exc')
+    automaton.make_automaton()
+    return automaton
+
+def classify(text, automaton):
+    """
+    Return True if the lowercased text has a keyword and no exclusion keyword
+    """
+    has_keyword = False
+    for _, tag in automaton.iter(text):
+        if tag == 'exc':
+            return False
+        has_keyword = True
+    return has_keyword
+
+def keyword_mask(descriptions, keywords, exclusion_keywords):
+    """
+    Boolean array marking lowercased descriptions that have a keyword and no exclusion keyword
+    """
+    if ahocorasick is not None:
+        # One automaton scan per description covers both keyword lists
+        automaton = build_keyword_automaton(keywords, exclusion_keywords)
+        return descriptions.map(lambda text: classify(text, automaton)).to_numpy(dtype=bool)
+    # Precompile one alternation per keyword list, then scan for exclusions only where a keyword matched
+    keyword_regex = re.compile('|'.join(re.escape(keyword.lower()) for keyword in keywords))
+    exclusion_regex = re.compile('|'.join(re.escape(keyword.lower()) for keyword in exclusion_keywords))
+    mask = descriptions.str.contains(keyword_regex)
+    mask[mask] = ~descriptions[mask].str.contains(exclusion_regex)
+    return mask.to_numpy(dtype=bool)
+
+def parse_repo_url(repo_url):
+    """
+    Extract (owner, repo) from a GitHub repository URL, or None if it is not one
     """
     # Convert GitHub URL to API URL
     if 'github.com' not in repo_url:
@@ -19,90 +95,238 @@ def get_github_stats(repo_url, github_token=None):
     if len(parts) < 5:
         return None
     
-    owner = parts[-2]
-    repo = parts[-1]
+    return parts[-2], parts[-1]
+
+def repo_key(repo_url):
+    """
+    Case-insensitive identity of the repository a URL points to
+    """
+    parsed = parse_repo_url(repo_url)
+    return (parsed[0].lower(), parsed[1].lower()) if parsed else repo_url
+
+async def get_github_stats(session, repo_url, limiter):
+    """
+    Get repository statistics from GitHub API
+    """
+    parsed = parse_repo_url(repo_url)
+    if parsed is None:
+        return None, None
+    
+    owner, repo = parsed
+    api_url = f"https://api.github.com/repos/{owner}/{repo}"
+    commits_url = f"https://api.github.com/repos/{owner}/{repo}/commits?per_page=1"
     
-    # Prepare headers with token if provided
-    headers = {}
-    if github_token:
-        headers['Authorization'] = f'token {github_token}'
+    async def fetch_repo_info():
+        # Get basic repo info
+        async with limiter:
+            async with session.get(api_url) as response:
+                if not getattr(response, 'from_cache', False):
+                    limiter.update(response.headers)
+                if response.status != 200:
+                    return None, response.status
+                return json_loads(await response.read()), response.status
+    
+    async def fetch_commits_link():
+        # Only the Link header is needed for the commit count, so skip the body with HEAD
+        async with limiter:
+            async with session.head(commits_url) as response:
+                if not getattr(response, 'from_cache', False):
+                    limiter.update(response.headers)
+                return response.headers.get('Link'), response.status
     
     try:
-        # Get basic repo info
-        repo_url = f"https://api.github.com/repos/{owner}/{repo}"
-        response = requests.get(repo_url, headers=headers)
-        if response.status_code != 200:
-            print(f"Error fetching {repo_url}: {response.status_code}")
-            if response.status_code == 403:
+        (repo_data, repo_status), (link_header, status_code) = await asyncio.gather(
+            fetch_repo_info(), fetch_commits_link())
+        
+        if repo_status != 200:
+            print(f"Error fetching {api_url}: {repo_status}")
+            if repo_status == 403:
                 print("Rate limit exceeded. Please provide a GitHub token to increase the limit.")
-            if response.status_code == 409:
-                print(f"Repository {repo_url} is empty or in conflict (Status 409)")
-            return None, response.status_code
+            if repo_status == 409:
+                print(f"Repository {api_url} is empty or in conflict (Status 409)")
+            return None, repo_status
         
-        repo_data = response.json()
         stars = repo_data.get('stargazers_count', 0)
+        # Repository size (KB) comes with the repo info, so no per-file requests are needed
+        size_kb = repo_data.get('size', 0)
         
-        # Get commit count
-        commits_url = f"https://api.github.com/repos/{owner}/{repo}/commits?per_page=1"
-        response = requests.get(commits_url, headers=headers)
-        if response.status_code != 200:
-            print(f"Error fetching commits for {repo_url}: {response.status_code}")
-            return None, response.status_code
+        # Check the commit count request
+        if status_code != 200:
+            print(f"Error fetching commits for {api_url}: {status_code}")
+            return None, status_code
         
-        # Get total commit count from the Link header
-        commit_count = 0
-        if 'Link' in response.headers:
-            links = response.headers['Link'].split(',')
-            for link in links:
-                if 'rel="last"' in link:
-                    # Extract the page number from the URL
-                    try:
-                        last_page_url = link.split(';')[0].strip('<>')
-                        last_page = int(last_page_url.split('page=')[2].split('&')[0])
-                        commit_count = last_page
-                    except (IndexError, ValueError):
-                        print(f"Warning: Could not parse commit count from {link}")
-                        commit_count = 0
-        
-        # # Get repository contents recursively
-        # contents_url = f"https://api.github.com/repos/{owner}/{repo}/git/trees/main?recursive=1"
-        # response = requests.get(contents_url, headers=headers)
-        # if response.status_code != 200:
-        #     # Try master branch if main doesn't exist
-        #     contents_url = f"https://api.github.com/repos/{owner}/{repo}/git/trees/master?recursive=1"
-        #     response = requests.get(contents_url, headers=headers)
-        #     if response.status_code != 200:
-        #         print(f"Error fetching contents for {repo_url}: {response.status_code}")
-        #         return None
-        
-        # contents_data = response.json()
-        # file_count = 0
-        # total_lines = 0
-        
-        # # Count files and get their sizes
-        # for item in contents_data.get('tree', []):
-        #     if item['type'] == 'blob':  # It's a file
-        #         file_count += 1
-        #         # Get file content to count lines
-        #         file_url = f"https://api.github.com/repos/{owner}/{repo}/contents/{item['path']}"
-        #         file_response = requests.get(file_url, headers=headers)
-        #         if file_response.status_code == 200:
-        #             file_data = file_response.json()
-        #             if 'content' in file_data:
-        #                 content = file_data['content']
-        #                 # Count lines in the content
-        #                 total_lines += len(content.split('\n'))
+        # Get total commit count from the last page in the Link header; no Link means a single page
+        match = LAST_PAGE_RE.search(link_header or '')
+        commit_count = int(match.group(1)) if match else 1
         
         return {
             'stars': stars,
             'commit_count': commit_count,
-            # 'file_count': file_count,
-            # 'total_lines': total_lines
-        }, response.status_code
+            'size_kb': size_kb
+        }, status_code
     except Exception as e:
         print(f"Error processing {repo_url}: {str(e)}")
         return None, None
 
+async def get_github_stats_batch(session, repo_urls, limiter):
+    """
+    Get statistics for a batch of repositories with a single aliased GraphQL query
+    """
+    results = [(None, None)] * len(repo_urls)
+    aliases = [(i, parse_repo_url(url)) for i, url in enumerate(repo_urls)]
+    aliases = [(i, parsed) for i, parsed in aliases if parsed is not None]
+    if not aliases:
+        return results
+    
+    query = "query {\n" + "\n".join(
+        f"  r{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(repo)}) {{ {GRAPHQL_REPO_FIELDS} }}"
+        for i, (owner, repo) in aliases) + "\n}"
+    
+    try:
+        async with limiter:
+            async with session.post(GRAPHQL_URL, json={'query': query}) as response:
+                if not getattr(response, 'from_cache', False):
+                    limiter.update(response.headers)
+                status_code = response.status
+                payload = json_loads(await response.read()) if status_code == 200 else None
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+        # A failed batch leaves (None, None) for every repository in it instead of aborting the run
+        print(f"Error processing GraphQL batch: {str(e) or type(e).__name__}")
+        return results
+    
+    if status_code != 200:
+        print(f"Error fetching GraphQL batch: {status_code}")
+        for i, _ in aliases:
+            results[i] = (None, status_code)
+        return results
+    
+    # A 200 response can still carry errors: per-alias NOT_FOUND, or a query-wide failure such as RATE_LIMITED
+    errors = payload.get('errors') or []
+    not_found = {error['path'][0] for error in errors if error.get('type') == 'NOT_FOUND' and error.get('path')}
+    other_errors = [error for error in errors if error.get('type') != 'NOT_FOUND']
+    if other_errors:
+        print(f"GraphQL batch errors: {', '.join(sorted({str(error.get('type') or error.get('message')) for error in other_errors}))}")
+    
+    data = payload.get('data') or {}
+    for i, _ in aliases:
+        node = data.get(f"r{i}")
+        if node is None:
+            # Only NOT_FOUND aliases are reported as 404; anything else stays (None, None) as a failed lookup
+            if f"r{i}" in not_found:
+                results[i] = (None, 404)
+            continue
+        # Empty repositories have no default branch and therefore no commits
+        target = (node.get('defaultBranchRef') or {}).get('target') or {}
+        results[i] = ({
+            'stars': node['stargazerCount'],
+            'commit_count': (target.get('history') or {}).get('totalCount', 0),
+            'size_kb': node['diskUsage'] or 0
+        }, 200)
+    return results
+
+def load_cached_stats(keys):
+    """
+    Return the unexpired GraphQL stats cached for the given (owner, repo) keys
+    """
+    wanted = {f"{owner}/{repo}": (owner, repo) for owner, repo in keys}
+    with closing(sqlite3.connect(STATS_CACHE_PATH)) as conn:
+        conn.execute("CREATE TABLE IF NOT EXISTS stats (repo TEXT PRIMARY KEY, stats TEXT, status INTEGER, fetched_at REAL)")
+        rows = conn.execute("SELECT repo, stats, status FROM stats WHERE fetched_at >= ?",
+                            (time.time() - CACHE_EXPIRE_SECONDS,)).fetchall()
+    return {wanted[repo]: (json.loads(stats) if stats else None, status) for repo, stats, status in rows if repo in wanted}
+
+def save_cached_stats(results):
+    """
+    Store GraphQL stats by (owner, repo) key; only definite answers (found or not found) are cached
+    """
+    now = time.time()
+    entries = [(f"{owner}/{repo}", json.dumps(stats) if stats else None, status, now)
+               for (owner, repo), (stats, status) in results.items() if status in (200, 404)]
+    with closing(sqlite3.connect(STATS_CACHE_PATH)) as conn, conn:
+        conn.execute("CREATE TABLE IF NOT EXISTS stats (repo TEXT PRIMARY KEY, stats TEXT, status INTEGER, fetched_at REAL)")
+        conn.executemany("INSERT OR REPLACE INTO stats VALUES (?, ?, ?, ?)", entries)
+
+async def run_worker_pool(jobs, worker_count, on_error):
+    """
+    Run (coroutine function, *args) jobs from a queue on a fixed pool of workers, returning results in job order;
+    a job that raises is logged and replaced by on_error(*args) so the other results are kept
+    """
+    queue = asyncio.Queue()
+    for index, job in enumerate(jobs):
+        queue.put_nowait((index, job))
+    results = [None] * len(jobs)
+    progress = tqdm_asyncio(total=len(jobs))
+    
+    async def worker():
+        while True:
+            index, (func, *args) = await queue.get()
+            try:
+                results[index] = await func(*args)
+            except Exception as e:
+                print(f"Error in {func.__name__}: {str(e) or type(e).__name__}")
+                results[index] = on_error(*args)
+            finally:
+                progress.update()
+                queue.task_done()
+    
+    workers = [asyncio.create_task(worker()) for _ in range(min(worker_count, len(jobs)))]
+    try:
+        await queue.join()
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        progress.close()
+    return results
+
+async def fetch_all_stats(urls, github_token=None):
+    """
+    Fetch statistics for all repository URLs concurrently over one HTTP session
+    """
+    # Prepare headers with token if provided
+    headers = {}
+    if github_token:
+        headers['Authorization'] = f'token {github_token}'
+    
+    # One pooled connector for the whole run: connections to api.github.com stay alive and are
+    # capped at the limiter's concurrency, and the DNS lookup is cached for the run
+    max_concurrency = 64
+    connector = aiohttp.TCPConnector(limit=max_concurrency, ttl_dns_cache=300, keepalive_timeout=60)
+    if CachedSession is not None:
+        cache = SQLiteBackend(CACHE_PATH, expire_after=CACHE_EXPIRE_SECONDS,
+                              allowed_codes=(200, 404), allowed_methods=('GET', 'HEAD'))
+        session = CachedSession(cache=cache, headers=headers, connector=connector)
+    else:
+        print("\nNote: aiohttp-client-cache is not installed, so REST responses are not cached between runs.")
+        session = aiohttp.ClientSession(headers=headers, connector=connector)
+    
+    # URLs differing only in case or a trailing slash name the same repository; fetch each repository once
+    keys = [repo_key(url) for url in urls]
+    unique_urls = dict(zip(keys, urls))
+    
+    limiter = RateLimiter(max_concurrency=max_concurrency)
+    async with session:
+        if github_token:
+            # GraphQL requires a token; each request then covers a whole batch of repositories. POST responses
+            # bypass the HTTP cache, so parsed stats are cached per repository and only the misses are fetched
+            stats_by_key = load_cached_stats([key for key in unique_urls if isinstance(key, tuple)])
+            fetch_keys = [key for key in unique_urls if key not in stats_by_key]
+            fetch_urls = [unique_urls[key] for key in fetch_keys]
+            batches = [fetch_urls[i:i + GRAPHQL_BATCH_SIZE] for i in range(0, len(fetch_urls), GRAPHQL_BATCH_SIZE)]
+            batch_results = await run_worker_pool([(get_github_stats_batch, session, batch, limiter)
+                                                   for batch in batches], max_concurrency,
+                                                  on_error=lambda session, batch, limiter: [(None, None)] * len(batch))
+            fetched = dict(zip(fetch_keys, (result for batch in batch_results for result in batch)))
+            save_cached_stats({key: result for key, result in fetched.items() if isinstance(key, tuple)})
+            stats_by_key.update(fetched)
+        else:
+            # A fixed pool of workers drains the URL queue instead of one pending task per repository
+            results = await run_worker_pool([(get_github_stats, session, url, limiter)
+                                             for url in unique_urls.values()], max_concurrency,
+                                            on_error=lambda session, url, limiter: (None, None))
+            stats_by_key = dict(zip(unique_urls, results))
+    return [stats_by_key[key] for key in keys]
+
 def analyze_repo_stats(df):
     """
     Analyze repository statistics and print distributions
@@ -128,25 +352,14 @@ def analyze_repo_stats(df):
         labels = ['0-10', '11-100', '101-1000', '1001-10000', '10000+']
         print(pd.cut(df['commit_count'], bins=bins, labels=labels).value_counts().sort_index())
     
-    # # File count distribution
-    # if 'file_count' in df.columns:
-    #     print("\nFile Count Distribution:")
-    #     print(df['file_count'].describe())
-    #     print("\nFile Count Range Counts:")
-    #     bins = [0, 10, 100, 1000, 10000, float('inf')]
-    #     labels = ['0-10', '11-100', '101-1000', '1001-10000', '10000+']
-    #     df['files_range'] = pd.cut(df['file_count'], bins=bins, labels=labels)
-    #     print(df['files_range'].value_counts().sort_index())
-    
-    # # Total lines distribution
-    # if 'total_lines' in df.columns:
-    #     print("\nTotal Lines of Code Distribution:")
-    #     print(df['total_lines'].describe())
-    #     print("\nTotal Lines Range Counts:")
-    #     bins = [0, 1000, 10000, 100000, 1000000, float('inf')]
-    #     labels = ['0-1K', '1K-10K', '10K-100K', '100K-1M', '1M+']
-    #     df['lines_range'] = pd.cut(df['total_lines'], bins=bins, labels=labels)
-    #     print(df['lines_range'].value_counts().sort_index())
+    # Repository size distribution
+    if 'size_kb' in df.columns:
+        print("\nRepository Size (KB) Distribution:")
+        print(df['size_kb'].describe())
+        print("\nRepository Size Range Counts:")
+        bins = [0, 100, 1000, 10000, 100000, float('inf')]
+        labels = ['0-100KB', '100KB-1MB', '1MB-10MB', '10MB-100MB', '100MB+']
+        print(pd.cut(df['size_kb'], bins=bins, labels=labels).value_counts().sort_index())
 
 def filter_csv_by_keywords():
     # Define the keywords to match
@@ -187,8 +400,13 @@ def filter_csv_by_keywords():
     
     print(f"Processing file: {input_file}")
     
-    # Read the Excel file
-    df = pd.read_excel(input_file)
+    # Convert the Excel sheet to Parquet once; later runs read the columnar copy
+    input_parquet = os.path.splitext(input_file)[0] + ".parquet"
+    if not os.path.exists(input_parquet) or os.path.getmtime(input_parquet) < os.path.getmtime(input_file):
+        pd.read_excel(input_file).to_parquet(input_parquet, index=False)
+    
+    # Read the Parquet file
+    df = pd.read_parquet(input_parquet)
     
     # Check if the required columns exist
     if len(df.columns) < 2:
@@ -198,21 +416,21 @@ def filter_csv_by_keywords():
     # Get the description column (second column)
     description_col = df.columns[1]
     
-    # Create a function to check if any keyword exists in the description
-    def contains_keyword(text):
-        if pd.isna(text):
-            return False
-        return any(keyword.lower() in str(text).lower() for keyword in keywords)
-    
-    # Create a function to check if any exclusion keyword exists in the description
-    def contains_exclusion_keyword(text):
-        if pd.isna(text):
-            return False
-        return any(keyword.lower() in str(text).lower() for keyword in exclusion_keywords)
-    
-    # Filter the dataframe - first include records with keywords, then exclude records with exclusion keywords
-    filtered_df = df[df[description_col].apply(contains_keyword)]
-    filtered_df = filtered_df[~filtered_df[description_col].apply(contains_exclusion_keyword)]
+    # Filter the dataframe in a single pass - keep records with keywords and without exclusion keywords
+    # Lowercase the descriptions once; both matchers work on the lowercased keywords
+    descriptions = df[description_col].fillna('').astype(str).str.lower()
+    if len(descriptions) > PARALLEL_FILTER_MIN_ROWS:
+        # Large sheets: match row slices in worker processes, one per available CPU
+        n_workers = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+        chunk_size = math.ceil(len(descriptions) / n_workers)
+        chunks = [descriptions.iloc[i:i + chunk_size] for i in range(0, len(descriptions), chunk_size)]
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            masks = list(executor.map(keyword_mask, chunks, repeat(keywords), repeat(exclusion_keywords)))
+        mask = np.concatenate(masks)
+    else:
+        mask = keyword_mask(descriptions, keywords, exclusion_keywords)
+    del descriptions
+    filtered_df = df[mask]
     
     # Get GitHub token from environment variable
     github_token = os.environ.get('GITHUB_TOKEN')
@@ -223,41 +441,38 @@ def filter_csv_by_keywords():
     
     # Get GitHub statistics for each repository
     print("\nFetching GitHub statistics for repositories...")
-    stats_data = []
-    status_codes = []  # 用于存储每个仓库的状态码
+    # Fetch each distinct GitHub URL once, then map the results back onto every row
+    urls = filtered_df['url'].dropna().drop_duplicates()
+    urls = urls[urls.str.contains('github.com/', regex=False)].tolist()
+    stats_by_url = dict(zip(urls, asyncio.run(fetch_all_stats(urls, github_token))))
     
-    for url in tqdm(filtered_df['url']):
-        stats, status_code = get_github_stats(url, github_token)
+    # Fill one preallocated array per column; NaN marks repositories without statistics
+    n = len(filtered_df)
+    stars = np.full(n, np.nan)
+    commit_counts = np.full(n, np.nan)
+    sizes = np.full(n, np.nan)
+    status_codes = np.zeros(n, dtype=np.int16)  # 0 表示未请求到状态码
+    for i, url in enumerate(filtered_df['url']):
+        stats, status_code = stats_by_url.get(url, (None, None))
         if stats:
-            stats_data.append(stats)
-        else:
-            stats_data.append({'stars': None, 'commit_count': None})  # 添加空数据
-        status_codes.append(status_code)  # 记录状态码
-        time.sleep(1)  # Rate limiting
-    
-    # 添加状态码列
-    filtered_df['status_code'] = status_codes
+            stars[i] = stats['stars']
+            commit_counts[i] = stats['commit_count']
+            sizes[i] = stats['size_kb']
+        if status_code is not None:
+            status_codes[i] = status_code
     
     # Add statistics to the dataframe
-    if stats_data:
-        stats_df = pd.DataFrame(stats_data)
-        # 检查行数是否匹配
-        if len(stats_df) != len(filtered_df):
-            print(f"\nError: Number of rows mismatch!")
-            print(f"Filtered DataFrame rows: {len(filtered_df)}")
-            print(f"Stats DataFrame rows: {len(stats_df)}")
-            print("Please check the data consistency.")
-            return
-        filtered_df = pd.concat([filtered_df.reset_index(drop=True), stats_df], axis=1)
+    filtered_df = filtered_df.assign(status_code=status_codes, stars=stars,
+                                     commit_count=commit_counts, size_kb=sizes)
     
     # Analyze and print statistics
     analyze_repo_stats(filtered_df)
     
     # Generate output filename
-    output_file = os.path.join(script_dir, f"filtered_{os.path.basename(input_file)}")
+    output_file = os.path.join(script_dir, f"filtered_{os.path.basename(input_parquet)}")
     
     # Save the filtered results
-    filtered_df.to_excel(output_file, index=False)
+    filtered_df.to_parquet(output_file, index=False)
     print(f"\nFiltered results saved to: {output_file}")
     print(f"Original records: {len(df)}")
     print(f"Filtered records: {len(filtered_df)}")